@@ -6,6 +6,7 @@ actual icon content ~84% of the total canvas size.
 """
 
 from PIL import Image
+import numpy as np
 import os
 
 BASE_DIR = '/Users/cory.naegle/ArborChat/build'
@@ -27,6 +28,11 @@ ICON_SIZES = [
     ('icon_512x512@2x.png', 1024),
 ]
 
+# One shared canvas buffer sized for the largest icon; each call slices a
+# view instead of allocating a fresh RGBA canvas
+MAX_CANVAS_SIZE = 1024
+_canvas_buf = np.zeros((MAX_CANVAS_SIZE, MAX_CANVAS_SIZE, 4), dtype=np.uint8)
+
 def add_padding_to_icon(source_path, target_path, canvas_size):
     """
     Add transparent padding around an icon.
@@ -38,20 +44,27 @@ def add_padding_to_icon(source_path, target_path, canvas_size):
     # Calculate the new content size (84% of canvas)
     content_size = int(canvas_size * CONTENT_RATIO)
     
-    # Resize the icon to the content size with high quality
-    resized = img.resize((content_size, content_size), Image.Resampling.LANCZOS)
-    
-    # Create a new transparent canvas
-    canvas = Image.new('RGBA', (canvas_size, canvas_size), (0, 0, 0, 0))
+    # Resize the icon to the content size. Tiny icons don't benefit from
+    # LANCZOS, so fall back to the much cheaper bilinear filter there.
+    if canvas_size <= 32:
+        resample = Image.Resampling.BILINEAR
+    else:
+        resample = Image.Resampling.LANCZOS
+    resized = img.resize((content_size, content_size), resample)
     
+    # Reuse the shared buffer as a transparent canvas
+    buf = _canvas_buf[:canvas_size, :canvas_size]
+    buf[:] = 0
+
     # Calculate position to center the icon
     offset = (canvas_size - content_size) // 2
-    
-    # Paste the resized icon onto the canvas
-    canvas.paste(resized, (offset, offset), resized)
-    
-    # Save the result
-    canvas.save(target_path, 'PNG')
+
+    # Copy the resized icon (alpha included) into the centered view
+    buf[offset:offset + content_size, offset:offset + content_size] = np.asarray(resized)
+
+    # Save the result. Fast zlib setting - these icons get repacked into
+    # the .icns by iconutil, so the compression ratio is irrelevant.
+    Image.fromarray(buf, 'RGBA').save(target_path, 'PNG', compress_level=1, optimize=False)
     return True
 
 def main():
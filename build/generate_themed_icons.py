@@ -6,6 +6,7 @@ The tree stays white in all variants.
 """
 
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 import os
 import shutil
@@ -43,64 +44,76 @@ def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
-def recolor_icon(source_path, target_path, new_bg_color):
+def compute_background_mask(data):
     """
-    Recolor an icon by replacing the background color with a new color.
-    Keeps the white tree unchanged.
+    Compute the background mask for a decoded icon.
+    The mask only depends on the base icon, not the theme,
+    so it can be shared across every themed variant.
     """
-    # Load image
-    img = Image.open(source_path).convert('RGBA')
-    data = np.array(img)
-    
-    # Extract channels
-    r, g, b, a = data[:,:,0], data[:,:,1], data[:,:,2], data[:,:,3]
-    
     # The original background is approximately #5865f2 (blue-purple)
     # We need to detect pixels that are NOT white/near-white (the tree)
     # and replace them with the new background color
-    
-    # White/near-white threshold (the tree is white)
+
+    # White/near-white threshold (the tree is white). Comparing all three
+    # channels in one fused reduction avoids the per-channel bool temps.
     white_threshold = 200
-    is_white = (r > white_threshold) & (g > white_threshold) & (b > white_threshold)
-    
-    # Also consider transparent pixels (corners due to rounded rect)
-    is_transparent = a < 128
-    
-    # Everything that's not white and not transparent is background
-    is_background = ~is_white & ~is_transparent
-    
-    # Get new color
-    new_r, new_g, new_b = hex_to_rgb(new_bg_color)
-    
-    # Apply new background color
-    data[is_background, 0] = new_r
-    data[is_background, 1] = new_g
-    data[is_background, 2] = new_b
-    
-    # Save result
-    result = Image.fromarray(data, 'RGBA')
-    result.save(target_path)
+    is_white = (data[..., :3] > white_threshold).all(axis=-1)
+
+    # Opaque pixels only - transparent corners (rounded rect) stay put
+    return ~is_white & (data[..., 3] >= 128)
+
+def load_base_icons(base_iconset_path):
+    """
+    Decode each base icon once and precompute its background mask.
+    Returns {filename: (pixel array, background mask)} so the theme
+    loop only has to do the recolor write, not re-decode the PNGs.
+    """
+    base_icons = {}
+    for filename, expected_size in ICON_SIZES:
+        source_path = os.path.join(base_iconset_path, filename)
+        if os.path.exists(source_path):
+            data = np.array(Image.open(source_path).convert('RGBA'))
+            base_icons[filename] = (data, compute_background_mask(data))
+    return base_icons
+
+def recolor_icon(data, is_background, target_path, new_bg_color):
+    """
+    Recolor an icon by replacing the background color with a new color.
+    Keeps the white tree unchanged.
+    """
+    # Copy the shared base pixels so each theme gets its own buffer
+    themed = data.copy()
+
+    # Apply new background color in one broadcast masked copy - a single
+    # contiguous pass over the pixels, no fancy-indexing gather/scatter
+    new_color = np.array(hex_to_rgb(new_bg_color), dtype=np.uint8)
+    np.copyto(themed[..., :3], new_color, where=is_background[..., None])
+
+    # Save result. Fast zlib setting - iconutil re-reads and repacks these
+    # into the .icns anyway, so the compression ratio is irrelevant.
+    result = Image.fromarray(themed, 'RGBA')
+    result.save(target_path, 'PNG', compress_level=1, optimize=False)
     return True
 
-def create_themed_iconset(theme_name, theme_color, base_iconset_path, output_dir):
-    """Create a complete iconset for a theme."""
+def create_themed_iconset(theme_name, theme_color, base_icons, output_dir):
+    """Create a complete iconset for a theme from the preloaded base icons."""
     iconset_name = f'icon-{theme_name}.iconset'
     iconset_path = os.path.join(output_dir, iconset_name)
-    
+
     # Create iconset directory
     os.makedirs(iconset_path, exist_ok=True)
-    
+
     # Process each icon size
     for filename, expected_size in ICON_SIZES:
-        source_path = os.path.join(base_iconset_path, filename)
         target_path = os.path.join(iconset_path, filename)
-        
-        if os.path.exists(source_path):
-            recolor_icon(source_path, target_path, theme_color)
+
+        if filename in base_icons:
+            data, is_background = base_icons[filename]
+            recolor_icon(data, is_background, target_path, theme_color)
             print(f"  Created {filename}")
         else:
             print(f"  WARNING: {filename} not found in source")
-    
+
     return iconset_path
 
 def convert_iconset_to_icns(iconset_path):
@@ -114,6 +127,25 @@ def convert_iconset_to_icns(iconset_path):
         print(f"  ERROR: Failed to create icns: {e}")
         return None
 
+# Per-process cache of the decoded base icons, loaded lazily so each
+# worker in the process pool only pays the decode cost once
+_worker_base_icons = None
+
+def process_theme(theme_name, theme_color, base_iconset, output_dir):
+    """Build one theme's iconset and convert it to .icns (pool worker)."""
+    global _worker_base_icons
+    if _worker_base_icons is None:
+        _worker_base_icons = load_base_icons(base_iconset)
+
+    iconset_path = create_themed_iconset(
+        theme_name,
+        theme_color,
+        _worker_base_icons,
+        output_dir
+    )
+    convert_iconset_to_icns(iconset_path)
+    return theme_name
+
 def main():
     base_path = '/Users/cory.naegle/ArborChat/build'
     base_iconset = os.path.join(base_path, 'icon.iconset')
@@ -126,22 +158,22 @@ def main():
     print("ArborChat Themed Icon Generator")
     print("=" * 60)
     print()
-    
-    for theme_name, theme_color in THEMES.items():
-        print(f"\n[{theme_name}] Background: {theme_color}")
-        print("-" * 40)
-        
-        # Create iconset
-        iconset_path = create_themed_iconset(
-            theme_name, 
-            theme_color, 
-            base_iconset, 
-            output_dir
-        )
-        
-        # Convert to .icns
-        convert_iconset_to_icns(iconset_path)
-    
+
+    # Themes are independent, so fan them out across CPU cores
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {
+            executor.submit(process_theme, theme_name, theme_color,
+                            base_iconset, output_dir): theme_name
+            for theme_name, theme_color in THEMES.items()
+        }
+        for future in as_completed(futures):
+            theme_name = futures[future]
+            try:
+                future.result()
+                print(f"[{theme_name}] done ({THEMES[theme_name]})")
+            except Exception as e:
+                print(f"[{theme_name}] ERROR: {e}")
+
     print()
     print("=" * 60)
     print("Done! All themed icons created in:")
@@ -5,9 +5,10 @@ Prepare complete iconset from existing icons and generate themed variants.
 
 from PIL import Image
 import os
-import subprocess
 import shutil
 
+import generate_themed_icons
+
 BASE_DIR = '/Users/cory.naegle/ArborChat/build'
 ICONSET_DIR = os.path.join(BASE_DIR, 'icon.iconset')
 
@@ -25,6 +26,17 @@ REQUIRED_SIZES = [
     ('icon_512x512@2x.png', 1024),
 ]
 
+def choose_resample(size, source_size):
+    """
+    Pick a resampling filter for a resize.
+    LANCZOS only pays off for large downscales; it adds ringing on
+    upscales and is indistinguishable from bilinear at tiny sizes,
+    while costing ~10x more per pixel.
+    """
+    if size > source_size or size <= 32:
+        return Image.Resampling.BILINEAR
+    return Image.Resampling.LANCZOS
+
 def prepare_iconset():
     """Generate all required icon sizes from the largest available."""
     print("=" * 60)
@@ -49,22 +61,31 @@ def prepare_iconset():
         print("ERROR: No source icon found!")
         return False
     
-    # Generate all required sizes
+    # Generate all required sizes, largest first, so each smaller size can
+    # cascade from the nearest larger result instead of the full source
     print("\nGenerating icons:")
-    for filename, size in REQUIRED_SIZES:
+    resized_cache = {source_size: source_img}
+    for filename, size in sorted(REQUIRED_SIZES, key=lambda x: -x[1]):
         target_path = os.path.join(ICONSET_DIR, filename)
-        
-        if size <= source_size:
-            # Downscale with high quality
-            resized = source_img.resize((size, size), Image.Resampling.LANCZOS)
+
+        if size in resized_cache:
+            # Already rendered at this size (or it IS the source) - reuse it
+            resized = resized_cache[size]
+        elif size < source_size:
+            # Downscale with high quality from the smallest cached image
+            # that is still larger than the target
+            nearest = min(s for s in resized_cache if s > size)
+            resized = resized_cache[nearest].resize((size, size), choose_resample(size, nearest))
         else:
             # Upscale (not ideal but necessary)
-            resized = source_img.resize((size, size), Image.Resampling.LANCZOS)
+            resized = source_img.resize((size, size), choose_resample(size, source_size))
             print(f"  WARNING: Upscaling to {size}px from {source_size}px")
-        
-        resized.save(target_path, 'PNG')
+
+        resized_cache[size] = resized
+        # Fast zlib setting - iconutil repacks these into the .icns anyway
+        resized.save(target_path, 'PNG', compress_level=1, optimize=False)
         print(f"  Created: {filename} ({size}x{size})")
-    
+
     return True
 
 def main():
@@ -72,13 +93,10 @@ def main():
         print("\n✅ Iconset prepared successfully!")
         print("\nNow running themed icon generator...")
         
-        # Run the themed icon generator
+        # Run the themed icon generator in-process - no second interpreter
+        # startup, PIL/numpy imports already paid for
         os.chdir(BASE_DIR)
-        result = subprocess.run(['python3', 'generate_themed_icons.py'], 
-                              capture_output=True, text=True)
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
+        generate_themed_icons.main()
     else:
         print("\n❌ Failed to prepare iconset")
 
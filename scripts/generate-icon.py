@@ -5,7 +5,9 @@ Creates a stylized tree on a themed background.
 """
 
 from PIL import Image, ImageDraw
+import functools
 import math
+import numpy as np
 import os
 import subprocess
 from pathlib import Path
@@ -13,141 +15,197 @@ from pathlib import Path
 # Midnight theme primary color
 THEME_COLOR = (88, 101, 242)  # #5865f2 in RGB
 
+# Unit-circle samples shared by every rotated ellipse (36-gon)
+_ELLIPSE_T = np.linspace(0, 2 * np.pi, 36, endpoint=False)
+_ELLIPSE_COS = np.cos(_ELLIPSE_T)
+_ELLIPSE_SIN = np.sin(_ELLIPSE_T)
+
 def draw_ellipse_rotated(draw, center, rx, ry, angle, fill):
     """Draw a rotated ellipse by creating points and drawing a polygon."""
     cx, cy = center
-    points = []
-    for i in range(36):
-        t = 2 * math.pi * i / 36
-        x = rx * math.cos(t)
-        y = ry * math.sin(t)
-        # Rotate
-        rad = math.radians(angle)
-        x_rot = x * math.cos(rad) - y * math.sin(rad)
-        y_rot = x * math.sin(rad) + y * math.cos(rad)
-        points.append((cx + x_rot, cy + y_rot))
-    draw.polygon(points, fill=fill)
+    rad = math.radians(angle)
+    cos_r, sin_r = math.cos(rad), math.sin(rad)
+    # Scale the precomputed unit circle and rotate it in one vectorized pass
+    x = rx * _ELLIPSE_COS
+    y = ry * _ELLIPSE_SIN
+    points = np.stack([cx + x * cos_r - y * sin_r,
+                       cy + x * sin_r + y * cos_r], axis=1)
+    draw.polygon([tuple(p) for p in points.tolist()], fill=fill)
+
+# Static tree geometry at the 512x512 design size.
+# The original SVG has: translate(256, 256) scale(0.75) translate(-256, -256)
+
+# Trunk, both root flares, and the lower widening merged into a single
+# outline at design time - they are all the same fill and mutually
+# overlapping, so the union draws in one polygon call
+TRUNK_OUTLINE = [
+    (256, 300), (268, 320), (268, 380), (264, 385), (264, 450),
+    (282, 480), (230, 480), (248, 450), (248, 385), (244, 380), (244, 320)
+]
+CROWN_BOX = [(246, 55), (266, 105)]
+
+BRANCH_LEVELS = [
+    # (y_center, x_spread, droop, width)
+    (340, 96, 20, 8),   # Level 1
+    (300, 116, 10, 7),  # Level 2
+    (260, 136, 0, 6),   # Level 3
+    (220, 126, -10, 5), # Level 4
+    (180, 106, -25, 4), # Level 5
+    (140, 86, -30, 3),  # Level 6
+]
+
+LEAF_DATA = [
+    # (cx, cy, rx, ry, angle)
+    (160, 355, 12, 8, -30), (180, 340, 10, 6, -20),
+    (352, 355, 12, 8, 30), (332, 340, 10, 6, 20),
+    (140, 305, 14, 9, -25), (165, 290, 11, 7, -15),
+    (372, 305, 14, 9, 25), (347, 290, 11, 7, 15),
+    (120, 255, 15, 10, -20), (150, 242, 12, 8, -10),
+    (392, 255, 15, 10, 20), (362, 242, 12, 8, 10),
+    (130, 205, 14, 9, -15), (160, 192, 11, 7, -5),
+    (382, 205, 14, 9, 15), (352, 192, 11, 7, 5),
+    (150, 150, 13, 8, -10), (180, 155, 10, 6, 0),
+    (362, 150, 13, 8, 10), (332, 155, 10, 6, 0),
+    (170, 105, 12, 7, -5), (200, 95, 9, 5, 5),
+    (342, 105, 12, 7, 5), (312, 95, 9, 5, -5),
+]
+
+def _branch_polylines():
+    """Expand BRANCH_LEVELS into the 12 branch polylines (base-512 coords)."""
+    polylines = []
+    for y, spread, droop, width in BRANCH_LEVELS:
+        for side in (-1, 1):
+            polylines.append((width, (
+                (256, y),
+                (256 + side * (spread // 2), y - 20 + droop),
+                (256 + side * spread, y + droop),
+            )))
+    return polylines
+
+# The branch geometry never changes, so expand it once at import
+BRANCH_POLYLINES = _branch_polylines()
+
+def _collect_scale_values():
+    """Gather every base-512 coordinate the drawing code ever scales."""
+    values = set()
+    for pts in (TRUNK_OUTLINE, CROWN_BOX):
+        for x, y in pts:
+            values.update((x, y))
+    for width, polyline in BRANCH_POLYLINES:
+        for x, y in polyline:
+            values.update((x, y))
+    for cx, cy, rx, ry, angle in LEAF_DATA:
+        values.update((cx, cy))
+    return values
+
+def _collect_width_values():
+    """Gather every base-512 width/radius the drawing code ever scales."""
+    values = {width for y, spread, droop, width in BRANCH_LEVELS}
+    for cx, cy, rx, ry, angle in LEAF_DATA:
+        values.update((rx * 2, ry * 2))
+    return values
+
+# The geometry is static, so the full set of scalable values is known up front
+SCALE_VALUES = _collect_scale_values()
+WIDTH_VALUES = _collect_width_values()
+
+# Quadratic bezier basis, sampled once at import (21 points = 20 segments)
+_BEZIER_T = np.linspace(0, 1, 21)
+_BEZIER_B0 = (1 - _BEZIER_T) ** 2
+_BEZIER_B1 = 2 * (1 - _BEZIER_T) * _BEZIER_T
+_BEZIER_B2 = _BEZIER_T ** 2
 
 def draw_bezier_branch(draw, points, width, fill):
     """Draw a curved branch using line segments approximating a bezier."""
     # Simple quadratic bezier approximation
     if len(points) >= 3:
         p0, p1, p2 = points[0], points[1], points[2]
-        segments = 20
-        prev = p0
-        for i in range(1, segments + 1):
-            t = i / segments
-            # Quadratic bezier
-            x = (1-t)**2 * p0[0] + 2*(1-t)*t * p1[0] + t**2 * p2[0]
-            y = (1-t)**2 * p0[1] + 2*(1-t)*t * p1[1] + t**2 * p2[1]
-            draw.line([prev, (x, y)], fill=fill, width=width)
-            prev = (x, y)
+        # Evaluate the curve in one vectorized pass and draw it as a
+        # single polyline instead of one line call per segment
+        xs = _BEZIER_B0 * p0[0] + _BEZIER_B1 * p1[0] + _BEZIER_B2 * p2[0]
+        ys = _BEZIER_B0 * p0[1] + _BEZIER_B1 * p1[1] + _BEZIER_B2 * p2[1]
+        draw.line(list(zip(xs.tolist(), ys.tolist())), fill=fill, width=width)
 
-def create_arbor_icon(size, output_path):
-    """Create an ArborChat icon at the specified size."""
-    # Create image with theme color background
-    img = Image.new('RGBA', (size, size), THEME_COLOR + (255,))
-    draw = ImageDraw.Draw(img)
-    
-    # Calculate iOS-style rounded corners (~22%)
+# Master render size; every output is a downsample of this single draw
+MASTER_SIZE = 1024
+
+@functools.lru_cache(maxsize=None)
+def _rounded_mask(size):
+    """Rounded-rectangle alpha mask with iOS-style ~22% corners, per size."""
     corner_radius = int(size * 0.22)
-    
-    # Create rounded rectangle mask
     mask = Image.new('L', (size, size), 0)
     mask_draw = ImageDraw.Draw(mask)
     mask_draw.rounded_rectangle([(0, 0), (size-1, size-1)], corner_radius, fill=255)
-    
-    # Create a new image with the background and apply the mask
-    bg = Image.new('RGBA', (size, size), THEME_COLOR + (255,))
-    
+    return mask
+
+def render_arbor_icon(size):
+    """Draw the full ArborChat tree at the given size."""
+    # Create image with theme color background
+    img = Image.new('RGBA', (size, size), THEME_COLOR + (255,))
+    draw = ImageDraw.Draw(img)
+
+    # Rounded corner mask (cached per size)
+    mask = _rounded_mask(size)
+
     # Scale factor for drawing (base design is 512x512)
     scale = size / 512
     
     # Draw tree elements (white)
     white = (255, 255, 255, 255)
     
-    # Offset to center the tree (scaled from transform translate)
-    def s(val):
-        """Scale a value from 512 base to current size with centering offset."""
-        # The original SVG has: translate(256, 256) scale(0.75) translate(-256, -256)
-        # This means the tree is centered and scaled to 75%
-        centered = (val - 256) * 0.75 + 256
-        return int(centered * scale)
-    
-    def sw(val):
-        """Scale a width value."""
-        return max(1, int(val * 0.75 * scale))
-    
-    # Main trunk
-    trunk_points = [(s(248), s(480)), (s(248), s(320)), (s(264), s(320)), (s(264), s(480))]
-    draw.polygon(trunk_points, fill=white)
-    
-    # Root flare left
-    draw.polygon([(s(230), s(480)), (s(248), s(450)), (s(248), s(480))], fill=white)
-    # Root flare right
-    draw.polygon([(s(264), s(480)), (s(264), s(450)), (s(282), s(480))], fill=white)
-    
-    # Lower trunk widening (simplified)
-    draw.polygon([
-        (s(244), s(380)), (s(244), s(320)), (s(256), s(300)), 
-        (s(268), s(320)), (s(268), s(380)), (s(256), s(395))
-    ], fill=white)
-    
-    # Draw branches (simplified curved lines)
-    branch_levels = [
-        # (y_center, x_spread, droop, width)
-        (340, 96, 20, 8),   # Level 1
-        (300, 116, 10, 7),  # Level 2
-        (260, 136, 0, 6),   # Level 3
-        (220, 126, -10, 5), # Level 4
-        (180, 106, -25, 4), # Level 5
-        (140, 86, -30, 3),  # Level 6
-    ]
-    
-    for y, spread, droop, width in branch_levels:
-        # Left branch
-        draw.line([
-            (s(256), s(y)), 
-            (s(256 - spread//2), s(y - 20 + droop)),
-            (s(256 - spread), s(y + droop))
-        ], fill=white, width=sw(width))
-        # Right branch
-        draw.line([
-            (s(256), s(y)),
-            (s(256 + spread//2), s(y - 20 + droop)),
-            (s(256 + spread), s(y + droop))
-        ], fill=white, width=sw(width))
-    
+    # Scale lookup tables, computed once per icon. The geometry is static,
+    # so every coordinate/width is scaled exactly once instead of per call.
+    # S centers the tree and scales to 75% (from the SVG transform), SW
+    # scales stroke widths with a 1px floor.
+    S = {v: int(((v - 256) * 0.75 + 256) * scale) for v in SCALE_VALUES}
+    SW = {v: max(1, int(v * 0.75 * scale)) for v in WIDTH_VALUES}
+
+    # Trunk, root flares, and lower widening (one pre-merged outline)
+    draw.polygon([(S[x], S[y]) for x, y in TRUNK_OUTLINE], fill=white)
+
+    # Draw branches (simplified curved lines). The polylines are expanded
+    # at import, so each branch is just scale lookups plus one line call.
+    for width, polyline in BRANCH_POLYLINES:
+        draw.line([(S[x], S[y]) for x, y in polyline],
+                  fill=white, width=SW[width])
+
     # Crown/Top
-    draw.ellipse([
-        (s(246), s(55)), (s(266), s(105))
-    ], fill=white)
-    
+    draw.ellipse([(S[x], S[y]) for x, y in CROWN_BOX], fill=white)
+
     # Draw leaves at various levels
-    leaf_data = [
-        # (cx, cy, rx, ry, angle)
-        (160, 355, 12, 8, -30), (180, 340, 10, 6, -20),
-        (352, 355, 12, 8, 30), (332, 340, 10, 6, 20),
-        (140, 305, 14, 9, -25), (165, 290, 11, 7, -15),
-        (372, 305, 14, 9, 25), (347, 290, 11, 7, 15),
-        (120, 255, 15, 10, -20), (150, 242, 12, 8, -10),
-        (392, 255, 15, 10, 20), (362, 242, 12, 8, 10),
-        (130, 205, 14, 9, -15), (160, 192, 11, 7, -5),
-        (382, 205, 14, 9, 15), (352, 192, 11, 7, 5),
-        (150, 150, 13, 8, -10), (180, 155, 10, 6, 0),
-        (362, 150, 13, 8, 10), (332, 155, 10, 6, 0),
-        (170, 105, 12, 7, -5), (200, 95, 9, 5, 5),
-        (342, 105, 12, 7, 5), (312, 95, 9, 5, -5),
-    ]
-    
-    for cx, cy, rx, ry, angle in leaf_data:
-        draw_ellipse_rotated(draw, (s(cx), s(cy)), sw(rx*2), sw(ry*2), angle, white)
+    for cx, cy, rx, ry, angle in LEAF_DATA:
+        draw_ellipse_rotated(draw, (S[cx], S[cy]), SW[rx*2], SW[ry*2], angle, white)
     
-    # Apply rounded corner mask
-    final = Image.composite(img, Image.new('RGBA', (size, size), (0, 0, 0, 0)), mask)
-    
-    # Save
-    final.save(output_path, 'PNG')
+    # Apply rounded corner mask. The image is fully opaque, so writing the
+    # mask straight into the alpha channel is equivalent to compositing
+    # over a transparent canvas, without the extra allocation and blend.
+    img.putalpha(mask)
+    return img
+
+# Cache of the icon at each size, seeded by one master render
+_icon_cache = {}
+
+def icon_at_size(size):
+    """
+    Return the icon at the requested size.
+    The tree is drawn once at MASTER_SIZE; smaller sizes cascade down
+    through 2x resizes so each step is a cheap small-factor LANCZOS.
+    """
+    if size not in _icon_cache:
+        if size >= MASTER_SIZE:
+            _icon_cache[size] = render_arbor_icon(size)
+        else:
+            parent = size * 2 if size * 2 <= MASTER_SIZE else MASTER_SIZE
+            _icon_cache[size] = icon_at_size(parent).resize(
+                (size, size), Image.Resampling.LANCZOS)
+    return _icon_cache[size]
+
+def create_arbor_icon(size, output_path):
+    """Create an ArborChat icon file at the specified size."""
+    final = icon_at_size(size)
+    # Fast zlib setting - these PNGs are intermediates that iconutil / the
+    # ICO packer immediately re-read and repack, so size doesn't matter
+    final.save(output_path, 'PNG', compress_level=1, optimize=False)
     print(f"Created: {output_path}")
     return final
 